@@ -1,11 +1,203 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request
 import instaloader
+import instaloader.instaloadercontext
+import gzip
+import hashlib
 import os
+import random
 import re
-import http.cookiejar
+import threading
+import orjson
+import time
+import cachetools
+from concurrent.futures import Future, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 app = Flask(__name__)
 
+COOKIES_FILE = "cookies/cookies.txt"
+
+# Paths are resolved once, relative to the script directory
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_COOKIES_PATH = os.path.join(_SCRIPT_DIR, COOKIES_FILE)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
+
+class _PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose connection pool outlives the sessions it is mounted on.
+    Instaloader runs each query on a throwaway copy of its session and closes
+    it afterwards, so close() is ignored to keep connections alive.
+    """
+    def close(self):
+        pass
+
+# One keep-alive pool shared by every Instagram request in this worker.
+# Retry only covers transport errors (failed connects, and read errors on
+# GETs); HTTP status codes, 429 included, are handled by _fetch_post.
+_ADAPTER = _PooledAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+)
+
+def _mount_adapter(session):
+    """
+    Mount the shared connection pool on a requests session.
+
+    Args:
+        session (requests.Session): Session to mount the adapter on
+    Returns:
+        requests.Session: The same session
+    """
+    session.mount("http://", _ADAPTER)
+    session.mount("https://", _ADAPTER)
+    return session
+
+_copy_session = instaloader.instaloadercontext.copy_session
+
+def _pooled_copy_session(session, request_timeout=None):
+    """Instaloader's copy_session, but reusing the shared connection pool."""
+    return _mount_adapter(_copy_session(session, request_timeout))
+
+instaloader.instaloadercontext.copy_session = _pooled_copy_session
+
+class _NoWaitRateController(instaloader.RateController):
+    """
+    RateController that never waits and keeps no query history.
+    A loader shared by all traffic would otherwise fill Instaloader's sliding
+    window after ~200 lookups and sleep for minutes inside every request;
+    _fetch_post is the only throttle instead.
+    """
+    def wait_before_query(self, query_type):
+        pass
+
+    def query_waittime(self, query_type, current_time, untracked_queries=False):
+        return 0.0
+
+# Shared Instaloader instance, kept alive for the life of the worker.
+# sleep=False only skips the random pause do_sleep() adds before each query
+# (~1.7 s on average). max_connection_attempts=1 stops Instaloader retrying
+# failed queries, so its handle_429 never runs; _fetch_post retries instead.
+_LOADER = instaloader.Instaloader(
+    user_agent=USER_AGENT,
+    sleep=False,
+    quiet=True,
+    max_connection_attempts=1,
+    rate_controller=lambda context: _NoWaitRateController(context)
+)
+_mount_adapter(_LOADER.context._session)
+_LOADER_LOCK = threading.Lock()
+_session_cookies = None
+
+def _set_session_cookies(cookies):
+    """
+    Set session cookies on the shared Instaloader context if they changed.
+
+    Args:
+        cookies (dict): Cookies (sessionid, csrftoken) to use for requests
+    """
+    global _session_cookies
+    with _LOADER_LOCK:
+        if cookies == _session_cookies:
+            return
+        session = _LOADER.context._session
+        session.cookies.set("sessionid", cookies["sessionid"], domain=".instagram.com")
+        session.cookies.set("csrftoken", cookies["csrftoken"], domain=".instagram.com")
+        _session_cookies = cookies
+
+def ojsonify(obj, status=200):
+    """
+    Build a JSON response serialized with orjson instead of the stdlib json module.
+    
+    Args:
+        obj: JSON-serializable object
+        status (int): HTTP status code
+    Returns:
+        Response: Flask response with an application/json body
+    """
+    return json_bytes_response(orjson.dumps(obj), status)
+
+def json_bytes_response(body, status=200):
+    """
+    Build a JSON response from an already serialized body.
+    
+    Args:
+        body (bytes): JSON-encoded response body
+        status (int): HTTP status code
+    Returns:
+        Response: Flask response with an application/json body
+    """
+    return app.response_class(body, status=status, mimetype="application/json")
+
+MAX_CONCURRENT_FETCHES = 8
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0  # seconds
+BACKOFF_CAP = 30.0  # seconds
+BACKOFF_JITTER = 0.5
+
+# Excess requests wait here instead of being refused by Instagram
+_FETCH_SLOTS = threading.Semaphore(MAX_CONCURRENT_FETCHES)
+_backoff_until = 0.0
+
+def _is_rate_limited(error):
+    """
+    Check whether an Instaloader error was caused by a 429 Too Many Requests response.
+    
+    Args:
+        error (Exception): Exception raised by Instaloader
+    Returns:
+        bool: True if a TooManyRequestsException is in the cause chain
+    """
+    while error is not None:
+        if isinstance(error, instaloader.exceptions.TooManyRequestsException):
+            return True
+        error = error.__cause__
+    return False
+
+def _backoff_delay(attempt):
+    """
+    Exponential backoff with jitter for the given retry attempt.
+    
+    Args:
+        attempt (int): Number of attempts that already failed, minus one
+    Returns:
+        float: Seconds to wait before the next attempt
+    """
+    return min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)) * (1 + random.random() * BACKOFF_JITTER)
+
+def _fetch_post(shortcode):
+    """
+    Fetch post metadata, retrying transient connection errors with backoff.
+    While Instagram is rate limiting us, all callers wait locally.
+    
+    Args:
+        shortcode (str): Instagram post shortcode
+    Returns:
+        instaloader.Post: Post with its metadata loaded
+    """
+    global _backoff_until
+    for attempt in range(MAX_RETRIES + 1):
+        wait = _backoff_until - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            with _FETCH_SLOTS:
+                return instaloader.Post.from_shortcode(_LOADER.context, shortcode)
+        except instaloader.exceptions.QueryReturnedNotFoundException:
+            raise
+        except instaloader.exceptions.ConnectionException as e:
+            if attempt == MAX_RETRIES:
+                raise
+            delay = _backoff_delay(attempt)
+            if _is_rate_limited(e):
+                _backoff_until = max(_backoff_until, time.monotonic() + delay)
+            else:
+                time.sleep(delay)
+
+_SHORTCODE_RE = re.compile(r'instagram\.com/p/([A-Za-z0-9_-]+)')
+
 def validate_url(url):
     """
     Validate and extract shortcode from Instagram URL.
@@ -15,115 +207,240 @@ def validate_url(url):
     Returns:
         str: Shortcode if valid, None otherwise
     """
-    pattern = r'instagram\.com/p/([A-Za-z0-9-_]+)'
-    match = re.search(pattern, url)
-    if match:
-        return match.group(1)
-    return None
+    # Cheap substring check before running the regex
+    if 'instagram.com/p/' not in url:
+        return None
+    match = _SHORTCODE_RE.search(url)
+    return match.group(1) if match else None
+
+_NEEDED_COOKIES = frozenset({"sessionid", "csrftoken"})
+_HTTPONLY_PREFIX = "#HttpOnly_"
+
+def _parse_netscape_cookies(cookies_path):
+    """
+    Extract the Instagram session cookies from a Netscape-format cookies.txt file.
+    Only the domain, name and value fields are read; everything else is skipped.
+    
+    Args:
+        cookies_path (str): Path to cookies.txt file
+    Returns:
+        dict: Dictionary of the needed cookies found in the file
+    """
+    cookies = {}
+    with open(cookies_path, encoding="utf-8") as f:
+        for line in f:
+            # HttpOnly cookies are written as comments with a marker prefix
+            if line.startswith(_HTTPONLY_PREFIX):
+                line = line[len(_HTTPONLY_PREFIX):]
+            elif line.startswith("#"):
+                continue
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) != 7:
+                continue
+            domain, _, _, _, _, name, value = parts
+            if domain == ".instagram.com" and name in _NEEDED_COOKIES:
+                cookies[name] = value
+                if len(cookies) == len(_NEEDED_COOKIES):
+                    break
+    return cookies
+
+# Parsed cookies per path, as (st_mtime_ns, cookies)
+_COOKIE_CACHE = {}
 
 def load_cookies_from_file(cookies_path):
     """
     Load Instagram cookies from a Netscape-format cookies.txt file.
+    The parsed result is cached until the file's modification time changes.
     
     Args:
         cookies_path (str): Path to cookies.txt file
     Returns:
         dict: Dictionary of cookies (sessionid, csrftoken) or None if invalid
+    Raises:
+        OSError: If the file does not exist or cannot be accessed
     """
-    cookies = {}
+    mtime_ns = os.stat(cookies_path).st_mtime_ns
+    cached = _COOKIE_CACHE.get(cookies_path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
     try:
-        cookie_jar = http.cookiejar.MozillaCookieJar()
-        cookie_jar.load(cookies_path, ignore_discard=True, ignore_expires=True)
-        for cookie in cookie_jar:
-            if cookie.name in ["sessionid", "csrftoken"] and cookie.domain == ".instagram.com":
-                cookies[cookie.name] = cookie.value
-        if "sessionid" in cookies and "csrftoken" in cookies:
-            return cookies
-        else:
-            return None
+        cookies = _parse_netscape_cookies(cookies_path)
+        if not _NEEDED_COOKIES <= cookies.keys():
+            cookies = None
+        _COOKIE_CACHE[cookies_path] = (mtime_ns, cookies)
+        return cookies
     except Exception as e:
         return None
 
-def get_instagram_post_urls(url, cookies_file="cookies/cookies.txt"):
+# Set the session cookies once at startup; requests only re-apply them when cookies.txt changes
+try:
+    _startup_cookies = load_cookies_from_file(_COOKIES_PATH)
+except OSError:
+    _startup_cookies = None
+if _startup_cookies:
+    _set_session_cookies(_startup_cookies)
+
+MEDIA_CACHE_SIZE = 8192
+MEDIA_CACHE_TTL = 600  # seconds
+
+# Recently resolved media URLs per shortcode; TTLCache is not thread-safe on its own
+_MEDIA_CACHE = cachetools.TTLCache(maxsize=MEDIA_CACHE_SIZE, ttl=MEDIA_CACHE_TTL)
+_MEDIA_CACHE_LOCK = threading.RLock()
+
+def _get_cached_media_urls(shortcode):
+    """
+    Look up media URLs resolved for a shortcode within the last MEDIA_CACHE_TTL seconds.
+    
+    Args:
+        shortcode (str): Instagram post shortcode
+    Returns:
+        list: Cached media URLs, or None on a miss
+    """
+    with _MEDIA_CACHE_LOCK:
+        media_urls = _MEDIA_CACHE.get(shortcode)
+    return list(media_urls) if media_urls is not None else None
+
+def _cache_media_urls(shortcode, media_urls):
+    """
+    Remember the media URLs of a shortcode for MEDIA_CACHE_TTL seconds.
+    
+    Args:
+        shortcode (str): Instagram post shortcode
+        media_urls (list): Direct media URLs of the post
+    """
+    with _MEDIA_CACHE_LOCK:
+        _MEDIA_CACHE[shortcode] = tuple(media_urls)
+
+# Fetches in progress per shortcode, as a Future of the media URLs
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+def _extract_media_urls(post):
+    """
+    Collect the direct media URLs of a post, including every sidecar node.
+    
+    Args:
+        post (instaloader.Post): Post with its metadata loaded
+    Returns:
+        list: Direct media URLs of the post
+    """
+    media_urls = []
+
+    if post.is_video:
+        media_urls.append(post.video_url)
+    else:
+        media_urls.append(post.url)
+
+    # Handle multi-media posts (sidecar)
+    if post.typename == "GraphSidecar":
+        for node in post.get_sidecar_nodes():
+            media_urls.append(node.video_url if node.is_video else node.display_url)
+
+    return media_urls
+
+def _resolve_media_urls(shortcode):
+    """
+    Fetch the media URLs of a shortcode, sharing one Instagram lookup between
+    concurrent callers. Waiters get the first caller's result, or its exception.
+    
+    Args:
+        shortcode (str): Instagram post shortcode
+    Returns:
+        list: Direct media URLs of the post
+    """
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(shortcode)
+        is_owner = future is None
+        if is_owner:
+            future = _INFLIGHT[shortcode] = Future()
+    if not is_owner:
+        return list(future.result())
+
+    try:
+        # A fetch that finished just before we registered may have filled the cache
+        media_urls = _get_cached_media_urls(shortcode)
+        if media_urls is None:
+            media_urls = _extract_media_urls(_fetch_post(shortcode))
+            _cache_media_urls(shortcode, media_urls)
+        future.set_result(tuple(media_urls))
+        return media_urls
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            del _INFLIGHT[shortcode]
+
+# Results for the static error cases, shared between requests (never mutated)
+_ERR_INVALID_URL = {
+    "status": "error",
+    "message": "Invalid Instagram URL! Please ensure it contains a valid post code (e.g., instagram.com/p/XXXXX).",
+    "media_urls": []
+}
+_ERR_COOKIES_NOT_FOUND = {
+    "status": "error",
+    "message": f"Cookies file not found at {_COOKIES_PATH}. Ensure {COOKIES_FILE} exists with valid Instagram cookies in Netscape format.",
+    "media_urls": []
+}
+_ERR_COOKIES_INVALID = {
+    "status": "error",
+    "message": "Failed to load session from cookies.txt: Missing required cookies (sessionid, csrftoken) or invalid format.",
+    "media_urls": []
+}
+_ERR_LOGIN_REQUIRED = {
+    "status": "error",
+    "message": f"Login required! This post may be private or requires authentication. Provide a valid {COOKIES_FILE} with active session cookies.",
+    "media_urls": []
+}
+
+def get_instagram_post_urls(url):
     """
     Extract direct media URLs for an Instagram post.
-    Requires valid cookies in cookies_file.
+    Requires valid cookies in COOKIES_FILE.
     
     Args:
         url (str): Instagram post URL
-        cookies_file (str): Path to cookies.txt file for session authentication
     Returns:
         dict: Result with status, message, and media URLs (if successful)
     """
-    result = {"status": "error", "message": "", "media_urls": []}
-    
     # Validate URL
     shortcode = validate_url(url)
     if not shortcode:
-        result["message"] = "Invalid Instagram URL! Please ensure it contains a valid post code (e.g., instagram.com/p/XXXXX)."
-        return result
+        return _ERR_INVALID_URL
+
+    # Serve recently resolved posts without hitting Instagram
+    media_urls = _get_cached_media_urls(shortcode)
+    if media_urls is not None:
+        return {"status": "success", "message": "Media URLs extracted successfully.", "media_urls": media_urls}
 
     try:
-        # Initialize Instaloader with custom User-Agent
-        loader = instaloader.Instaloader(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
-        )
-
-        # Resolve absolute path for cookies file relative to script directory
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        cookies_path = os.path.join(script_dir, cookies_file)
-
-        # Check if cookies file exists
-        if not os.path.isfile(cookies_path):
-            result["message"] = f"Cookies file not found at {cookies_path}. Ensure {cookies_file} exists with valid Instagram cookies in Netscape format."
-            return result
-
-        # Load cookies
-        cookies = load_cookies_from_file(cookies_path)
+        # Load cookies (cached until cookies.txt changes)
+        try:
+            cookies = load_cookies_from_file(_COOKIES_PATH)
+        except OSError:
+            return _ERR_COOKIES_NOT_FOUND
         if not cookies:
-            result["message"] = "Failed to load session from cookies.txt: Missing required cookies (sessionid, csrftoken) or invalid format."
-            return result
+            return _ERR_COOKIES_INVALID
 
-        # Set cookies in the Instaloader context
-        loader.context._session.cookies.set("sessionid", cookies["sessionid"], domain=".instagram.com")
-        loader.context._session.cookies.set("csrftoken", cookies["csrftoken"], domain=".instagram.com")
+        # Set cookies in the shared Instaloader context
+        _set_session_cookies(cookies)
 
         # Get post and extract media URLs
-        post = instaloader.Post.from_shortcode(loader.context, shortcode)
-        media_urls = []
-
-        if post.is_video:
-            media_urls.append(post.video_url)
-        else:
-            media_urls.append(post.url)
-
-        # Handle multi-media posts (sidecar)
-        if post.typename == "GraphSidecar":
-            for node in post.get_sidecar_nodes():
-                media_urls.append(node.video_url if node.is_video else node.display_url)
-
-        result["status"] = "success"
-        result["message"] = "Media URLs extracted successfully."
-        result["media_urls"] = media_urls
-        return result
+        media_urls = _resolve_media_urls(shortcode)
+        return {"status": "success", "message": "Media URLs extracted successfully.", "media_urls": media_urls}
 
     except instaloader.exceptions.LoginRequiredException:
-        result["message"] = f"Login required! This post may be private or requires authentication. Provide a valid {cookies_file} with active session cookies."
-        return result
+        return _ERR_LOGIN_REQUIRED
     except instaloader.exceptions.BadResponseException as bre:
-        result["message"] = f"Instagram blocked the request (403 Forbidden): {str(bre)}. Ensure {cookies_file} contains valid, non-expired session cookies."
-        return result
+        message = f"Instagram blocked the request (403 Forbidden): {str(bre)}. Ensure {COOKIES_FILE} contains valid, non-expired session cookies."
+        return {"status": "error", "message": message, "media_urls": []}
     except Exception as e:
-        result["message"] = f"Oops! Something went wrong: {str(e)}. Check your internet connection, URL, cookies file, or try again later."
-        return result
+        message = f"Oops! Something went wrong: {str(e)}. Check your internet connection, URL, cookies file, or try again later."
+        return {"status": "error", "message": message, "media_urls": []}
 
-@app.route('/', methods=['GET'])
-def api_status():
-    """
-    Flask endpoint for API status page (GET request).
-    Returns a modern, responsive HTML page with API status, form for testing, and developer info.
-    """
-    html_content = """
+# Static status page, encoded and compressed once at import time
+_STATUS_HTML = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -181,6 +498,15 @@ curl -X POST https://your-api-url/download \\
             </pre>
             <p class="text-gray-600 mt-4"><strong>Note:</strong> Requires valid Instagram session cookies (<code>cookies/cookies.txt</code>) in Netscape format with <code>sessionid</code> and <code>csrftoken</code>.</p>
             
+            <!-- Batch Documentation -->
+            <h2 class="text-2xl font-semibold text-gray-800 mt-8 mb-4">POST /download/batch - Multiple Posts</h2>
+            <p class="text-gray-600 mb-4">Send up to 50 post URLs in a <code class="bg-gray-100 p-1 rounded">urls</code> list. Posts are fetched concurrently and <code class="bg-gray-100 p-1 rounded">results</code> holds one response per URL, in request order.</p>
+            <pre class="bg-gray-900 text-white p-4 rounded-lg overflow-x-auto">
+curl -X POST https://your-api-url/download/batch \\
+-H "Content-Type: application/json" \\
+-d '{"urls": ["https://www.instagram.com/p/XXXXX/", "https://www.instagram.com/p/YYYYY/"]}'
+            </pre>
+            
             <!-- Footer -->
             <div class="mt-12 text-center">
                 <p class="text-gray-600">Built with ❤️ by <a href="https://x.com/ISmartDevs" target="_blank" class="text-purple-600 hover:underline">@ISmartDevs</a></p>
@@ -230,7 +556,38 @@ curl -X POST https://your-api-url/download \\
     </body>
     </html>
     """
-    return html_content, 200
+_STATUS_BYTES = _STATUS_HTML.encode("utf-8")
+_STATUS_GZ = gzip.compress(_STATUS_BYTES, 6)
+_STATUS_ETAG = hashlib.sha1(_STATUS_BYTES).hexdigest()
+
+@app.route('/', methods=['GET'])
+def api_status():
+    """
+    Flask endpoint for API status page (GET request).
+    Returns a modern, responsive HTML page with API status, form for testing, and developer info.
+    """
+    if request.accept_encodings["gzip"]:
+        response = app.response_class(_STATUS_GZ, mimetype="text/html")
+        response.headers["Content-Encoding"] = "gzip"
+        response.set_etag(_STATUS_ETAG + "-gzip")
+    else:
+        response = app.response_class(_STATUS_BYTES, mimetype="text/html")
+        response.set_etag(_STATUS_ETAG)
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "public, max-age=3600"
+    return response.make_conditional(request)
+
+MAX_PAYLOAD_SIZE = 4096  # bytes
+
+# Bodies of the constant validation errors, serialized once at import time
+_ERR_NO_URL_JSON = orjson.dumps({
+    "status": "error",
+    "message": "Invalid request. Please provide a JSON payload with a 'url' field."
+})
+_ERR_EMPTY_URL_JSON = orjson.dumps({
+    "status": "error",
+    "message": "URL cannot be empty."
+})
 
 @app.route('/download', methods=['POST'])
 def download_post():
@@ -239,24 +596,70 @@ def download_post():
     Expects JSON payload: {"url": "https://www.instagram.com/p/XXXXX/"}
     Returns JSON response with status, message, and media URLs.
     """
-    data = request.get_json()
-    if not data or "url" not in data:
-        return jsonify({
-            "status": "error",
-            "message": "Invalid request. Please provide a JSON payload with a 'url' field."
-        }), 400
+    # Turn away probes without parsing their bodies. Chunked bodies carry no
+    # Content-Length, so the limit is also enforced while the body is read.
+    if not request.is_json or (request.content_length or 0) > MAX_PAYLOAD_SIZE:
+        return json_bytes_response(_ERR_NO_URL_JSON, 400)
+    request.max_content_length = MAX_PAYLOAD_SIZE
 
-    url = data["url"].strip()
+    data = request.get_json(silent=True, cache=False)
+    url = data.get("url") if isinstance(data, dict) else None
+    if not isinstance(url, str):
+        return json_bytes_response(_ERR_NO_URL_JSON, 400)
+
+    url = url.strip()
     if not url:
-        return jsonify({
-            "status": "error",
-            "message": "URL cannot be empty."
-        }), 400
+        return json_bytes_response(_ERR_EMPTY_URL_JSON, 400)
 
     # Get media URLs
     result = get_instagram_post_urls(url)
     status_code = 200 if result["status"] == "success" else 400
-    return jsonify(result), status_code
+    return ojsonify(result, status_code)
+
+MAX_BATCH_SIZE = 50
+MAX_BATCH_PAYLOAD_SIZE = MAX_BATCH_SIZE * MAX_PAYLOAD_SIZE  # bytes
+
+_ERR_NO_URLS_JSON = orjson.dumps({
+    "status": "error",
+    "message": "Invalid request. Please provide a JSON payload with a non-empty 'urls' list."
+})
+_ERR_TOO_MANY_URLS_JSON = orjson.dumps({
+    "status": "error",
+    "message": f"Too many URLs. A batch may contain at most {MAX_BATCH_SIZE} URLs."
+})
+
+# Shared by all batch requests so lookups reuse the pooled Instagram session
+_BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=16)
+
+@app.route('/download/batch', methods=['POST'])
+def download_batch():
+    """
+    Flask endpoint to extract media URLs for several Instagram posts in one request.
+    Expects JSON payload: {"urls": ["https://www.instagram.com/p/XXXXX/", ...]}
+    Returns JSON response with one result per URL, in request order.
+    """
+    # Turn away probes without parsing their bodies. Chunked bodies carry no
+    # Content-Length, so the limit is also enforced while the body is read.
+    if not request.is_json or (request.content_length or 0) > MAX_BATCH_PAYLOAD_SIZE:
+        return json_bytes_response(_ERR_NO_URLS_JSON, 400)
+    request.max_content_length = MAX_BATCH_PAYLOAD_SIZE
+
+    data = request.get_json(silent=True, cache=False)
+    urls = data.get("urls") if isinstance(data, dict) else None
+    if not isinstance(urls, list) or not urls:
+        return json_bytes_response(_ERR_NO_URLS_JSON, 400)
+
+    if len(urls) > MAX_BATCH_SIZE:
+        return json_bytes_response(_ERR_TOO_MANY_URLS_JSON, 400)
+
+    # Get media URLs concurrently; non-string entries fail validation
+    urls = [url.strip() if isinstance(url, str) else "" for url in urls]
+    results = list(_BATCH_EXECUTOR.map(get_instagram_post_urls, urls))
+    return ojsonify({"results": results})
 
 # For Vercel serverless (WSGI export)
 application = app
+
+if __name__ == '__main__':
+    # Local development server; use gunicorn (gunicorn.conf.py) in production
+    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", "5000")), threaded=True)
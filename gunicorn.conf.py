@@ -0,0 +1,14 @@
+# Gunicorn settings for running the API outside Vercel: gunicorn app:application
+# Install requirements-gunicorn.txt first; it adds gevent for the worker below.
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+
+# /download spends nearly all its time waiting on Instagram. The gevent worker
+# monkey-patches sockets before loading the app, so each blocked request
+# yields to the others and one worker parks hundreds of them at once.
+worker_class = "gevent"
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", "500"))
+timeout = 60
+keepalive = 5